@@ -2,17 +2,35 @@
 
 import os
 import fcntl
+import signal
 import ctypes
 import asyncio
 import subprocess
-import json
+import time
+import logging
+import tempfile
+from collections import deque, namedtuple
+from contextlib import contextmanager
 from pathlib import Path
 
 from decky import logger  # Decky-provided logger
 
+# Settings (de)serialization: orjson if available (e.g. dropped into py_modules), else stdlib json
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
 # ---------- Config ----------
 # Path to file to store user defined settings
 SETTINGS_FILE = Path(os.path.expanduser("~")) / "homebrew" / "settings" / "RumbleDeck.json"
+# Settings changes are written once after this many seconds without further changes
+SETTINGS_FLUSH_DELAY = 0.25
 
 # Select I²C bus via env var (default 0 is typical on Steam Deck)
 I2C_BUS = int(os.getenv("RUMBLEDECK_I2C_BUS", "0"))
@@ -27,12 +45,24 @@ MUX_ADDR = int(os.getenv("RUMBLEDECK_MUX_ADDR", "0x70"), 0)  # e.g., TCA9548A /
 # Paths
 ROOT = Path(__file__).resolve().parent
 SNIFFER = ROOT / "backend" / "out" / "rumble-sniffer"
+_SNIFFER_STR = str(SNIFFER)  # exec argument, built once
+
+# Max bytes taken from the sniffer pipe per read (split into lines afterwards)
+SNIFFER_READ_CHUNK = 64 * 1024
 
 # ioctl constants
-I2C_SLAVE = 0x0703
 I2C_RDWR  = 0x0707
 I2C_M_RD  = 0x0001
 
+# Size of the per-bus payload buffer (fits a full coalesced write batch)
+SCRATCH_SIZE = 128
+
+# Max queued writes the I²C worker merges into one I2C_RDWR transaction
+COALESCE_MAX = 8
+
+# Preallocated i2c_msg slots per bus (max messages per transaction)
+MSG_POOL_SIZE = 16
+
 # Device names
 _DEVICE_NAMES = {3: "DRV2605", 4: "DRV2604", 6: "DRV2604L", 7: "DRV2605L"}
 
@@ -42,6 +72,18 @@ REG_MODE   = 0x01  # STANDBY(6), MODE[2:0]
 REG_RTP    = 0x02
 REG_LIBSEL = 0x03  # HI_Z(4)
 REG_GO     = 0x0C  # GO(0)
+REG_VBAT   = 0x21  # supply voltage monitor
+
+# DRV2605 init sequence as (start_reg, data). Contiguous registers are
+# merged and written via the chip's register auto-increment.
+DRV_INIT_SEQ = [
+    (22, b"\x7e\x96"),                 # rated voltage, overdrive clamp
+    (26, b"\x36\x93\xf5\xa8"),         # feedback, control1..3
+    (3,  b"\x01"),                     # library 1
+    (1,  b"\x00"),                     # mode: internal trigger
+]
+# ...and as the ready-made write batch for RawI2C.write_many
+_DRV_INIT_WRITES = tuple((DRV_ADDR, reg, data) for reg, data in DRV_INIT_SEQ)
 
 # ---------- Low-level I²C helpers (no smbus) ----------
 class I2CMsg(ctypes.Structure):
@@ -58,12 +100,6 @@ class I2CRdwrIoctlData(ctypes.Structure):
         ("nmsgs", ctypes.c_uint32),
     ]
 
-def i2c_rdwr_xfer(fd, msgs):
-    array_type = I2CMsg * len(msgs)
-    arr = array_type(*msgs)
-    data = I2CRdwrIoctlData(ctypes.addressof(arr), len(msgs))
-    fcntl.ioctl(fd, I2C_RDWR, data)
-
 # Function to select if I2C-multiplexer is present (different RumbleBoard versions). Default = off
 
 def mux_select(mask: int):
@@ -75,9 +111,22 @@ class RawI2C:
     Minimal /dev/i2c-* writer. Opens on enter, closes on exit.
     Supports "register + bytes" write (what this plugin needs).
     """
+    __slots__ = ("bus", "fd", "_scratch", "_scratch_view", "_scratch_addr", "_msgs", "_hdr", "_ioctl")
+
     def __init__(self, bus: int):
         self.bus = bus
         self.fd = None
+        self._ioctl = fcntl.ioctl  # bound once; saves the module lookup per transfer
+        # Reusable payload buffer; messages point into it instead of
+        # allocating a fresh bytes/ctypes buffer per transfer.
+        self._scratch = bytearray(SCRATCH_SIZE)
+        # the ctypes view holds a buffer export, which pins the bytearray:
+        # a resize raises BufferError instead of leaving _scratch_addr dangling
+        self._scratch_view = (ctypes.c_ubyte * SCRATCH_SIZE).from_buffer(self._scratch)
+        self._scratch_addr = ctypes.addressof(self._scratch_view)
+        # Reusable i2c_msg array + ioctl header, filled in place per transfer
+        self._msgs = (I2CMsg * MSG_POOL_SIZE)()
+        self._hdr = I2CRdwrIoctlData(ctypes.addressof(self._msgs), 0)
 
     def __enter__(self):
         self.fd = os.open(f"/dev/i2c-{self.bus}", os.O_RDWR)
@@ -90,32 +139,112 @@ class RawI2C:
         finally:
             self.fd = None
 
-    def _set_addr(self, addr: int):
-        if self.fd is None:
-            raise RuntimeError("I2C device not opened")
-        fcntl.ioctl(self.fd, I2C_SLAVE, addr)
+    def _pack(self, off: int, reg: int, data) -> int:
+        """Place [reg][data...] into the scratch buffer at off; return end offset."""
+        buf = self._scratch
+        if isinstance(data, int):
+            end = off + 2
+            if end > SCRATCH_SIZE:
+                raise ValueError("I2C payload exceeds scratch buffer")
+            buf[off] = reg & 0xFF
+            buf[off + 1] = data & 0xFF
+        elif isinstance(data, (bytes, bytearray, list)):
+            end = off + 1 + len(data)
+            if end > SCRATCH_SIZE:
+                raise ValueError("I2C payload exceeds scratch buffer")
+            buf[off] = reg & 0xFF
+            buf[off + 1:end] = data
+        else:
+            raise TypeError(f"Unsupported data type for I2C write: {type(data)}")
+        return end
+
+    def _set_msg(self, i: int, addr: int, flags: int, n: int, buf: int):
+        m = self._msgs[i]
+        m.addr = addr
+        m.flags = flags
+        m.len = n
+        m.buf = buf
+
+    def _xfer(self, nmsgs: int):
+        self._hdr.nmsgs = nmsgs
+        self._ioctl(self.fd, I2C_RDWR, self._hdr)
 
     def write_reg(self, addr: int, reg: int, data):
         """
-        Write: [reg][data...]
-        data can be int or bytes/bytearray/list-of-ints.
+        Write: [reg][data...] as a single I2C_RDWR message, so the slave
+        address travels with the payload (no separate I2C_SLAVE ioctl).
+        data can be int or bytes/bytearray/list-of-ints (list items must
+        already be 0..255; ValueError otherwise).
         """
-        if isinstance(data, int):
-            payload = bytes([reg, data & 0xFF])
-        elif isinstance(data, (bytes, bytearray)):
-            payload = bytes([reg]) + bytes(data)
-        elif isinstance(data, list):
-            payload = bytes([reg]) + bytes([x & 0xFF for x in data])
-        else:
-            raise TypeError(f"Unsupported data type for I2C write: {type(data)}")
+        if self.fd is None:
+            raise RuntimeError("I2C device not opened")
+        n = self._pack(0, reg, data)
+        self._set_msg(0, addr, 0, n, self._scratch_addr)
+        self._xfer(1)
 
-        self._set_addr(addr)
-        os.write(self.fd, payload)
+    def write_many(self, writes):
+        """
+        Write several (addr, reg, data) blocks in a single I2C_RDWR ioctl,
+        one i2c_msg per block. Addresses may differ between messages
+        (e.g. mux select followed by DRV registers).
+        """
+        if self.fd is None:
+            raise RuntimeError("I2C device not opened")
+        if len(writes) > MSG_POOL_SIZE:
+            raise ValueError("too many writes for one I2C_RDWR transaction")
+        off = 0
+        for i, (addr, reg, data) in enumerate(writes):
+            end = self._pack(off, reg, data)
+            self._set_msg(i, addr, 0, end - off, self._scratch_addr + off)
+            off = end
+        self._xfer(len(writes))
+
+    def write_read(self, addr: int, reg: int, n: int = 1) -> bytes:
+        """
+        SMBus-style register read:
+        [START][addr W][reg][REPEATED START][addr R][n bytes]
+        Both messages go out in one I2C_RDWR ioctl, so the device never
+        sees a STOP between the pointer write and the read.
+        """
+        if self.fd is None:
+            raise RuntimeError("I2C device not opened")
+        if 1 + n > SCRATCH_SIZE:
+            raise ValueError("I2C read exceeds scratch buffer")
+        self._scratch[0] = reg & 0xFF
+        self._set_msg(0, addr, 0,        1, self._scratch_addr)
+        self._set_msg(1, addr, I2C_M_RD, n, self._scratch_addr + 1)
+        self._xfer(2)
+        return bytes(self._scratch[1:1 + n])
+
+# Bus handle held open by the Plugin between _main and _unload.
+# While it is None, every helper falls back to open → transfer → close.
+_shared_i2c: RawI2C | None = None
+
+def _open_shared_bus() -> RawI2C:
+    global _shared_i2c
+    if _shared_i2c is None:
+        _shared_i2c = RawI2C(I2C_BUS).__enter__()
+    return _shared_i2c
+
+def _close_shared_bus() -> None:
+    global _shared_i2c
+    if _shared_i2c is not None:
+        _shared_i2c.__exit__(None, None, None)
+        _shared_i2c = None
+
+@contextmanager
+def _bus():
+    """Yield the persistent bus if the plugin holds one, else a one-shot handle."""
+    if _shared_i2c is not None:
+        yield _shared_i2c
+    else:
+        with RawI2C(I2C_BUS) as i2c:
+            yield i2c
 
 def i2c_write(addr: int, reg: int, data):
-    """Open → write → close with robust logging."""
+    """Write on the shared bus (or open → write → close) with robust logging."""
     try:
-        with RawI2C(I2C_BUS) as i2c:
+        with _bus() as i2c:
             i2c.write_reg(addr, reg, data)
     except FileNotFoundError as e:
         logger.error(f"I2C bus /dev/i2c-{I2C_BUS} not found: {e}")
@@ -130,17 +259,9 @@ def i2c_write(addr: int, reg: int, data):
         raise
 
 def i2c_read_reg(addr: int, reg: int, n: int = 1) -> bytes:
-    """Correct I2C read: [START][addr W][reg][REPEATED START][addr R][n bytes]"""
-    with RawI2C(I2C_BUS) as i2c:
-        # prepare buffers
-        wbuf = (ctypes.c_ubyte * 1)(reg & 0xFF)
-        rbuf = (ctypes.c_ubyte * n)()
-        msgs = [
-            I2CMsg(addr=addr, flags=0,        len=1, buf=ctypes.addressof(wbuf)),
-            I2CMsg(addr=addr, flags=I2C_M_RD, len=n, buf=ctypes.addressof(rbuf)),
-        ]
-        i2c_rdwr_xfer(i2c.fd, msgs)
-        return bytes(rbuf)
+    """Combined write-then-read with repeated start (one ioctl)."""
+    with _bus() as i2c:
+        return i2c.write_read(addr, reg, n)
 
 def _encode_wait_ms(ms: int) -> int:
     """
@@ -150,39 +271,41 @@ def _encode_wait_ms(ms: int) -> int:
     ticks = max(0, min(127, ms // 10))
     return 0x80 | ticks  # 0x80..0xFF
 
-def _decode_status(s: int) -> dict: # diagnostic status read helper
-    return {
-        "raw": s,
-        "device_id": (s >> 5) & 0x7,        # 3=DRV2605, 7=DRV2605L
-        "diag_fail": bool(s & (1 << 3)),    # 0=pass, 1=fail
-        "fb_timeout": bool(s & (1 << 2)),
-        "over_temp": bool(s & (1 << 1)),
-        "over_current": bool(s & (1 << 0)),
-    }
+# Decoded STATUS register; converted to a dict only at the callable boundary
+Status = namedtuple("Status", "raw device_id diag_fail fb_timeout over_temp over_current device_name")
+
+def _decode_status(s: int) -> Status: # diagnostic status read helper
+    did = (s >> 5) & 0x7                    # 3=DRV2605, 7=DRV2605L
+    return Status(
+        s,
+        did,
+        bool(s & (1 << 3)),                 # diag_fail: 0=pass, 1=fail
+        bool(s & (1 << 2)),                 # fb_timeout
+        bool(s & (1 << 1)),                 # over_temp
+        bool(s & (1 << 0)),                 # over_current
+        _DEVICE_NAMES.get(did) or f"Unknown({did})",
+    )
 
 def _snapshot_status() -> dict: # make diagnostic status more verbose
-    s  = _decode_status(_read_u8(DRV_ADDR, REG_STATUS))  # NOTE: clears latched bits
-    md = _read_u8(DRV_ADDR, REG_MODE)
-    lb = _read_u8(DRV_ADDR, REG_LIBSEL)
-    name = _DEVICE_NAMES.get(s["device_id"], f"Unknown({s['device_id']})")
-    s.update({"device_name": name})
-    return s
+    return _decode_status(_read_u8(DRV_ADDR, REG_STATUS))._asdict()  # NOTE: reading STATUS clears latched bits
 
 def _read_u8(addr: int, reg: int) -> int:
     return i2c_read_reg(addr, reg, 1)[0]
 
 def _rmw_u8(addr: int, reg: int, clear_mask: int, set_mask: int):
-    v = _read_u8(addr, reg)
-    v = (v & ~clear_mask) | set_mask
-    i2c_write(addr, reg, v)
+    # read (pointer write + read, one ioctl) and write back on the same handle
+    with _bus() as i2c:
+        old = i2c.write_read(addr, reg, 1)[0]
+        v = (old & ~clear_mask) | set_mask
+        if v != old:  # bits already in place: skip the write
+            i2c.write_reg(addr, reg, v)
     return v
 
 # --- functions for the user preset manager ----
 
 def _load_settings() -> dict:
     try:
-        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _loads(SETTINGS_FILE.read_bytes())
     except Exception:
         data = {}
     # defaults
@@ -197,147 +320,426 @@ def _load_settings() -> dict:
     return data
 
 def _save_settings(data: dict) -> None:
+    # write to a temp file in the same dir, fsync and rename, so a crash never leaves a torn file
     SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    try:
+        mode = SETTINGS_FILE.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=SETTINGS_FILE.parent, prefix=".RumbleDeck.", delete=False
+    ) as f:
+        try:
+            f.write(_dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+            os.fchmod(f.fileno(), mode)  # mkstemp creates 0600; keep the file's mode
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    try:
+        os.replace(f.name, SETTINGS_FILE)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+def _module_loaded(name: str) -> bool:
+    """True if the kernel module is already loaded (sysfs uses '_' for '-')."""
+    return Path("/sys/module", name.replace("-", "_")).exists()
 
 # ---------- Device-specific actions ----------
-async def drv_test():
-    """Simple test: trigger rumble 3× (non-blocking)."""
-    for _ in range(3):
-        i2c_write(DRV_ADDR, 0x0C, 0x01)  # GO = 1
-        await asyncio.sleep(0.2)
+async def drv_test(effect: int = 1):
+    """
+    Simple test: rumble 3×. The pulses and 200 ms gaps are queued in the
+    waveform sequencer (0x04..) and fired with a single GO, so the chip
+    paces itself. The user's sequence in those slots is saved first and
+    written back once playback has finished.
+    """
+    wait = _encode_wait_ms(200)
+    with _bus() as i2c:
+        saved = i2c.write_read(DRV_ADDR, 0x04, 8)
+        i2c.write_many([
+            (DRV_ADDR, REG_MODE, 0x00),  # MODE: internal trigger, standby=0
+            (DRV_ADDR, 0x04, bytes([effect, wait, effect, wait, effect, 0x00])),
+            (DRV_ADDR, REG_GO, b"\x01"),  # GO = 1
+        ])
+        # GO clears when the pattern is done; 3 s ceiling
+        deadline = time.monotonic() + 3.0
+        delay = 0.01
+        while (i2c.write_read(DRV_ADDR, REG_GO, 1)[0] & 0x01) and time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+        i2c.write_reg(DRV_ADDR, 0x04, saved)
+
+# Per DRV2605 docs: 5.6 V full-scale over an 8-bit reading
+_VBAT_SCALE = 5.6 / 255.0
 
 def _vbat_to_volts(raw: int) -> float: # Helper to convert VBAT into volts
-    # Per DRV2605 docs: 5.6 V full-scale
-    return (raw & 0xFF) * 5.6 / 255.0
-
-def drv_init():
-    """Initialize DRV2605 with your register sequence."""
-    i2c_write(DRV_ADDR, 22, 126)
-    i2c_write(DRV_ADDR, 23, 150)
-    i2c_write(DRV_ADDR, 26, 54)
-    i2c_write(DRV_ADDR, 27, 147)
-    i2c_write(DRV_ADDR, 28, 245)
-    i2c_write(DRV_ADDR, 29, 168)
-    i2c_write(DRV_ADDR, 3,  1)
-    i2c_write(DRV_ADDR, 1,  0)
+    # raw is a single byte from the bus (0..255)
+    return raw * _VBAT_SCALE
+
+def drv_init(mux_mask: int | None = None):
+    """
+    Initialize DRV2605 with your register sequence (one I2C_RDWR batch).
+    If mux_mask is given, the mux is selected first in its own transfer:
+    the channel only switches on the STOP that ends it.
+    """
+    with _bus() as i2c:
+        if mux_mask is not None:
+            i2c.write_reg(MUX_ADDR, 0x00, mux_mask & 0xFF)
+        i2c.write_many(_DRV_INIT_WRITES)
 
 # ---------- Decky plugin ----------
 class Plugin:
     def __init__(self, *args, **kwargs):
         self.sniffer_process = None
         self._sniffer_reader = None
-        self._i2c_lock = asyncio.Lock()
+        self._sniffer_ok = False  # binary found executable once; later starts skip the stat
+        # All bus access is funneled through one worker task that owns the
+        # bus, so ops run one at a time without an asyncio.Lock per call.
+        self._i2c_q = deque()  # (op, future); op is callable or (addr, reg, data)
+        self._i2c_wakeup = asyncio.Event()
+        self._i2c_worker: asyncio.Task | None = None
+        self._drv_last_active = 0.0  # monotonic time of the last GO we fired (test/play)
+        # last value written per DRV register block (start reg -> bytes); lets
+        # setters skip writes that would not change anything. The chip can lose
+        # these values (power/EN cycle, suspend) without us noticing, so
+        # drv_startup and reset_device drop the shadow before touching the chip.
+        self._reg_shadow: dict[int, bytes] = {}
+        # in-memory settings (loaded in _main); changes are flushed to disk debounced
+        self._settings = None
+        self._settings_flush_task: asyncio.Task | None = None
         # mux state (loaded in _main)
         self.use_mux = False
         self.mux_mask = 1
+        # channel mask the mux was last set to by the worker (None = unknown)
+        self._last_mux_mask: int | None = None
+
+    # ---------- I²C worker ----------
+    async def _bus_worker(self):
+        q = self._i2c_q
+        while True:
+            if not q:
+                self._i2c_wakeup.clear()
+                await self._i2c_wakeup.wait()
+                continue
+            op, fut = q.popleft()
+            if isinstance(op, tuple):
+                # plain write: merge with any writes queued right behind it
+                batch = [(op, fut)]
+                while q and len(batch) < COALESCE_MAX and isinstance(q[0][0], tuple):
+                    batch.append(q.popleft())
+                self._run_write_batch(batch)
+                continue
+            if fut.cancelled():
+                continue
+            try:
+                res = op()
+                if asyncio.iscoroutine(res):
+                    res = await res
+            except asyncio.CancelledError:
+                if not fut.done():
+                    fut.set_exception(RuntimeError("unloading"))
+                raise
+            except Exception as e:
+                self._last_mux_mask = None  # bus state unknown after a failed op
+                if not fut.cancelled():
+                    fut.set_exception(e)
+            else:
+                if not fut.cancelled():
+                    fut.set_result(res)
+
+    def _run_write_batch(self, batch):
+        batch = [(w, fut) for w, fut in batch if not fut.cancelled()]
+        if not batch:
+            return
+        # Split into transfers: a mux select only switches the channel on
+        # the STOP ending its transfer, so every mux write closes one.
+        # Selects for the channel that is already selected are dropped.
+        segments = [[]]
+        mux = self._last_mux_mask
+        for w, fut in batch:
+            if w[0] == MUX_ADDR:
+                if w[2] == mux:
+                    fut.set_result(None)
+                    continue
+                mux = w[2]
+                segments[-1].append((w, fut))
+                segments.append([])
+            else:
+                segments[-1].append((w, fut))
+        for i, seg in enumerate(segments):
+            if not seg:
+                continue
+            try:
+                with _bus() as i2c:
+                    i2c.write_many([w for w, _ in seg])
+                results = [None] * len(seg)
+            except Exception as e:
+                logger.error(f"I2C batch write failed ({len(seg)} msgs): {e}")
+                results = [e] if len(seg) == 1 else self._write_each(seg)
+            for (_, fut), res in zip(seg, results):
+                if res is None:
+                    fut.set_result(None)
+                else:
+                    fut.set_exception(res)
+            last, res = seg[-1][0], results[-1]
+            if last[0] != MUX_ADDR:
+                continue
+            if res is not None:
+                # later transfers rely on this channel select, so fail them too
+                self._last_mux_mask = None
+                for rest in segments[i + 1:]:
+                    for _, fut in rest:
+                        fut.set_exception(res)
+                return
+            self._last_mux_mask = last[2]
+
+    def _write_each(self, seg) -> list:
+        """
+        Retry the writes of a failed transfer one at a time, so only the
+        write that NACKs reports an error; returns None or the exception
+        per write.
+        """
+        results = []
+        for w, _ in seg:
+            try:
+                with _bus() as i2c:
+                    i2c.write_reg(*w)
+            except Exception as e:
+                results.append(e)
+            else:
+                results.append(None)
+        return results
+
+    def _ensure_bus_worker(self):
+        if self._i2c_worker is None or self._i2c_worker.done():
+            self._i2c_worker = asyncio.create_task(self._bus_worker())
 
-    # helper: select current mux channel if enabled
+    async def _bus_call(self, op):
+        """
+        Run op() on the I²C worker and return its result. op may be a plain
+        function or return a coroutine (for ops that need to sleep while
+        keeping exclusive use of the bus).
+        """
+        self._ensure_bus_worker()
+        fut = asyncio.get_running_loop().create_future()
+        self._i2c_q.append((op, fut))
+        self._i2c_wakeup.set()
+        return await fut
+
+    async def _bus_write(self, writes):
+        """
+        Queue (addr, reg, data) writes in order. The worker coalesces
+        consecutive queued writes (from this or other callers) into one
+        I2C_RDWR transaction, ended early by each mux select. If a merged
+        transaction fails, its writes are retried one by one, so each caller
+        gets its own outcome; writes that had already reached the device
+        are sent a second time. A failed mux select fails every write
+        queued behind it.
+        """
+        self._ensure_bus_worker()
+        loop = asyncio.get_running_loop()
+        futs = []
+        for w in writes:
+            fut = loop.create_future()
+            self._i2c_q.append((w, fut))
+            futs.append(fut)
+        self._i2c_wakeup.set()
+        for res in await asyncio.gather(*futs, return_exceptions=True):
+            if isinstance(res, BaseException):
+                raise res
+
+    async def _write_cached(self, reg: int, data: bytes):
+        """
+        Write a DRV register block unless the shadow says it already holds data.
+        Check, write and shadow update all run on the worker, so ops that
+        clear the shadow (drv_startup, reset_device, ...) are strictly ordered
+        against them.
+        """
+        def _op():
+            if self._reg_shadow.get(reg) == data:
+                return
+            self._mux_select_current()
+            i2c_write(DRV_ADDR, reg, data)
+            self._reg_shadow[reg] = data
+        await self._bus_call(_op)
+
+    def _mux_writes(self) -> list:
+        """
+        Mux select as a queued write (empty when no mux is used). The worker
+        drops it if that channel is already selected.
+        """
+        return [(MUX_ADDR, 0x00, self.mux_mask & 0xFF)] if self.use_mux else []
+
+    # ---------- settings cache ----------
+    def _settings_dict(self) -> dict:
+        if self._settings is None:
+            self._settings = _load_settings()
+        return self._settings
+
+    def _schedule_settings_flush(self):
+        """(Re)arm the delayed write so a burst of changes costs one file write."""
+        if self._settings_flush_task is not None:
+            self._settings_flush_task.cancel()
+        self._settings_flush_task = asyncio.create_task(self._flush_settings_later())
+
+    async def _flush_settings_later(self):
+        await asyncio.sleep(SETTINGS_FLUSH_DELAY)
+        self._settings_flush_task = None
+        if self._settings is None:
+            return
+        # fsync can stall on slow storage; keep it off the event loop. The copy
+        # keeps setters on the loop from mutating the dict mid-serialisation.
+        await asyncio.to_thread(self._flush_settings, dict(self._settings))
+
+    def _flush_settings(self, settings: dict | None = None):
+        if settings is None:
+            settings = self._settings
+        if settings is None:
+            return
+        try:
+            _save_settings(settings)
+        except Exception as e:
+            logger.error(f"Saving settings failed: {e}")
+
+    # helper: select current mux channel if enabled (and not already selected)
     def _mux_select_current(self):
-        if self.use_mux:
-            i2c_write(MUX_ADDR, 0x00, self.mux_mask & 0xFF)
+        mask = self.mux_mask & 0xFF
+        if self.use_mux and mask != self._last_mux_mask:
+            self._last_mux_mask = None  # unknown until the write succeeds
+            i2c_write(MUX_ADDR, 0x00, mask)
+            self._last_mux_mask = mask
 
     # ---------- MUX config callables ----------
     async def get_config(self) -> dict:
-        s = _load_settings()
+        s = self._settings_dict()
         # keep runtime in sync
         self.use_mux = bool(s.get("use_mux", False))
         self.mux_mask = int(s.get("mux_mask", 1)) or 1
         return {"use_mux": self.use_mux, "mux_mask": self.mux_mask}
 
     async def set_use_mux(self, enabled: bool) -> None:
-        s = _load_settings()
+        s = self._settings_dict()
         s["use_mux"] = bool(enabled)
-        _save_settings(s)
+        self._schedule_settings_flush()
         self.use_mux = s["use_mux"]
+        self._reg_shadow.clear()  # shadow describes the previously addressed driver(s)
         logger.info(f"use_mux set to {self.use_mux}")
 
     async def set_mux_mask(self, mask: int) -> None:
         m = int(mask)
         if m not in (1, 2, 3):
             raise ValueError("mux_mask must be 1 (A), 2 (B), or 3 (Both)")
-        s = _load_settings()
+        s = self._settings_dict()
         s["mux_mask"] = m
-        _save_settings(s)
+        self._schedule_settings_flush()
         self.mux_mask = m
+        self._reg_shadow.clear()  # shadow describes the previously addressed driver(s)
         logger.info(f"mux_mask set to {self.mux_mask}")
 
     # ----- callable backend methods (async) -----
 
     async def my_backend_function(self) -> None:
         logger.info("my_backend_function called")
-        async with self._i2c_lock:
-            await drv_test()
+        await self._bus_call(drv_test)
+        self._drv_last_active = time.monotonic()
 
     async def drv_startup(self, both_active: bool = False) -> None:
+        """
+        (Re)initialize the driver(s). Also forgets the register shadow, so
+        after the DRV lost power the next setter calls write again even if
+        their values did not change.
+        """
         logger.info(f"drv_startup(both_active={both_active})")
-        async with self._i2c_lock:
-            # needs rework to work with mux_select
-            
-            # Select driver 1
-            #mux_select(0x01)
-            drv_init()
-            logger.info("Driver 1 initialized")
-
-            #if both_active:
-                # Select driver 2
-            #    mux_select(0x02)
-            #    drv_init()
-            #    logger.info("Driver 2 initialized")
-
-                # Enable both
-            #    mux_select(0x03)
-            #    await drv_test()
-            #    logger.info("Both drivers active")
-            #else:
-                # Keep only driver 1
-            #    mux_select(0x01)
-            #    await drv_test()
-            #    logger.info("Driver 1 active")
+        def _op():
+            self._reg_shadow.clear()  # init rewrites library and drive registers
+            if self.use_mux:
+                # per driver: mux select, then the init batch
+                self._last_mux_mask = None
+                drv_init(0x01)
+                logger.info("Driver 1 initialized")
+                if both_active:
+                    drv_init(0x02)
+                    logger.info("Driver 2 initialized")
+                # restore the user's channel selection
+                self._mux_select_current()
+            else:
+                drv_init()
+                logger.info("Driver 1 initialized")
+        await self._bus_call(_op)
 
     async def start_sniffer(self) -> None:
         if self.sniffer_process:
             logger.info("Sniffer already running")
             return
-        if not SNIFFER.exists():
-            logger.error(f"Sniffer binary missing: {SNIFFER}")
-            return
+        if not self._sniffer_ok:
+            # a missing binary is re-checked on every start, so building it later works
+            if not (SNIFFER.is_file() and os.access(_SNIFFER_STR, os.X_OK)):
+                logger.error(f"Sniffer binary missing or not executable: {SNIFFER}")
+                return
+            self._sniffer_ok = True
 
         logger.info(f"Starting sniffer: {SNIFFER}")
-        self.sniffer_process = subprocess.Popen(
-            [str(SNIFFER)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
+        self.sniffer_process = await asyncio.create_subprocess_exec(
+            _SNIFFER_STR,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True,  # own process group, so stop_sniffer reaches its helpers too
         )
         self._sniffer_reader = asyncio.create_task(self._read_sniffer())
 
     async def _read_sniffer(self):
+        # stdout is read by the event loop directly (no executor thread per line)
         try:
             assert self.sniffer_process and self.sniffer_process.stdout
-            loop = asyncio.get_running_loop()
+            stream = self.sniffer_process.stdout
+            # checked once per run: if INFO is off the loop only drains the pipe
+            info_enabled = logger.isEnabledFor(logging.INFO)
+            # take whatever is buffered in one read and split it here,
+            # keeping a partial trailing line for the next chunk
+            pending = b""
             while True:
-                line = await loop.run_in_executor(None, self.sniffer_process.stdout.readline)
-                if not line:
+                chunk = await stream.read(SNIFFER_READ_CHUNK)
+                if not chunk:
                     break
-                logger.info(f"[sniffer] {line.rstrip()}")
+                if not info_enabled:
+                    continue
+                lines = (pending + chunk if pending else chunk).split(b"\n")
+                pending = lines.pop()
+                if len(pending) > SNIFFER_READ_CHUNK:
+                    # no newline in sight: emit it as a line so pending stays bounded
+                    lines.append(pending)
+                    pending = b""
+                for line in lines:
+                    logger.info("[sniffer] %s", line.decode("utf-8", "replace").rstrip())
+            if pending:
+                logger.info("[sniffer] %s", pending.decode("utf-8", "replace").rstrip())
         except Exception as e:
             logger.error(f"sniffer reader error: {e}")
         finally:
             logger.info("sniffer stdout closed")
 
+    def _signal_sniffer_group(self, sig: int):
+        try:
+            os.killpg(self.sniffer_process.pid, sig)
+        except ProcessLookupError:
+            pass  # group already gone
+
     async def stop_sniffer(self) -> None:
         if not self.sniffer_process:
             logger.info("Sniffer not running")
             return
 
         logger.info("Stopping sniffer…")
-        self.sniffer_process.terminate()
         try:
-            self.sniffer_process.wait(timeout=3)
-        except Exception:
-            self.sniffer_process.kill()
+            # signal the whole group: helpers may outlive the sniffer itself
+            self._signal_sniffer_group(signal.SIGTERM)
+            await asyncio.wait_for(self.sniffer_process.wait(), timeout=3)
+        except asyncio.TimeoutError:
+            self._signal_sniffer_group(signal.SIGKILL)
+            await self.sniffer_process.wait()
         finally:
             self.sniffer_process = None
             if self._sniffer_reader:
@@ -350,86 +752,98 @@ class Plugin:
         Returns VDD (in volts). If the chip isn't actively playing,
         try a short tick to refresh VBAT, per datasheet.
         """
-        async with self._i2c_lock:
+        async def _op():
             self._mux_select_current()
-            try:
-                # 1) Try a direct read
-                raw = i2c_read_reg(DRV_ADDR, 0x21, 1)[0]
+            with _bus() as i2c:
+                # 1) Try a direct read (one combined transaction)
+                raw = i2c.write_read(DRV_ADDR, REG_VBAT, 1)[0]
                 volts = _vbat_to_volts(raw)
                 # If clearly invalid, nudge the device to "active" and sample again
-                if volts <= 0.1:
+                # (skipped when the chip was driven within the last second)
+                if volts <= 0.1 and (time.monotonic() - self._drv_last_active) > 1.0:
                     # brief GO pulse
-                    i2c_write(DRV_ADDR, 0x0C, 0x01)
+                    i2c.write_reg(DRV_ADDR, REG_GO, 0x01)
                     await asyncio.sleep(0.03)
-                    raw = i2c_read_reg(DRV_ADDR, 0x21, 1)[0]
+                    raw = i2c.write_read(DRV_ADDR, REG_VBAT, 1)[0]
                     volts = _vbat_to_volts(raw)
-                logger.info(f"VBAT raw=0x{raw:02X} -> {volts:.3f} V")
-                return float(volts)
-            except Exception as e:
-                logger.error(f"query_voltage failed: {e}")
-                # Decky callables must return JSON-serializable; re-raise to show error in UI
-                raise
-                
+            return raw, volts
+        try:
+            raw, volts = await self._bus_call(_op)
+            logger.info(f"VBAT raw=0x{raw:02X} -> {volts:.3f} V")
+            return float(volts)
+        except Exception as e:
+            logger.error(f"query_voltage failed: {e}")
+            # Decky callables must return JSON-serializable; re-raise to show error in UI
+            raise
+
     async def read_status(self) -> dict:
-        async with self._i2c_lock:
-            snap = _snapshot_status()
-        return snap
+        return await self._bus_call(_snapshot_status)
 
     async def set_standby(self, enabled: bool) -> None:
         """Set/clear software standby (MODE.6)."""
-        async with self._i2c_lock:
-            _rmw_u8(DRV_ADDR, REG_MODE, clear_mask=(1 << 6), set_mask=(1 << 6) if enabled else 0)
-        s = _load_settings()
+        await self._bus_call(
+            lambda: _rmw_u8(DRV_ADDR, REG_MODE, clear_mask=(1 << 6), set_mask=(1 << 6) if enabled else 0)
+        )
+        s = self._settings_dict()
         s["persist_standby"] = bool(enabled)
-        _save_settings(s)
+        self._schedule_settings_flush()
     
     async def set_high_z(self, enabled: bool) -> None:
         """Force true Hi-Z on outputs (LIBSEL.4)."""
-        async with self._i2c_lock:
-            _rmw_u8(DRV_ADDR, REG_LIBSEL, clear_mask=(1 << 4), set_mask=(1 << 4) if enabled else 0)
-        s = _load_settings()
+        def _op():
+            v = _rmw_u8(DRV_ADDR, REG_LIBSEL, clear_mask=(1 << 4), set_mask=(1 << 4) if enabled else 0)
+            self._reg_shadow[REG_LIBSEL] = bytes([v])
+        await self._bus_call(_op)
+        s = self._settings_dict()
         s["persist_hi_z"] = bool(enabled)
-        _save_settings(s)
+        self._schedule_settings_flush()
 
     async def run_diagnostics(self, mux_mask: int | None = None) -> dict:
-        async with self._i2c_lock:
-            if mux_mask is not None:
-                mux_select(mux_mask)
+        async def _op():
+            self._reg_shadow.clear()  # diagnostics may change device state
+            if mux_mask is not None and self.use_mux:
+                mask = int(mux_mask) & 0xFF
+                self._last_mux_mask = None  # unknown until the write succeeds
+                i2c_write(MUX_ADDR, 0x00, mask)
+                self._last_mux_mask = mask
             # MODE = Diagnostics (6), clear standby
             _rmw_u8(DRV_ADDR, REG_MODE, clear_mask=(1 << 6) | 0x07, set_mask=0x06)
-            i2c_write(DRV_ADDR, REG_GO, 0x01)
-            for _ in range(300):
-                if (_read_u8(DRV_ADDR, REG_GO) & 0x01) == 0:
-                    break
-                await asyncio.sleep(0.01)
-            snap = _snapshot_status()
+            with _bus() as i2c:
+                i2c.write_reg(DRV_ADDR, REG_GO, 0x01)
+                # poll GO with backoff (1, 2, 4, 8, 10, 10... ms), 3 s ceiling
+                deadline = time.monotonic() + 3.0
+                delay = 0.001
+                while (i2c.write_read(DRV_ADDR, REG_GO, 1)[0] & 0x01) and time.monotonic() < deadline:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 0.01)
+            return _snapshot_status()
+        snap = await self._bus_call(_op)
         snap["diag_pass"] = not snap.pop("diag_fail", False)
         logger.info(f"Diagnostics -> {snap}")
         return snap
 
     # ------------ Preset Manager functions
     async def list_presets(self) -> list[str]:
-        s = _load_settings()
-        return sorted(s.get("presets", {}).keys())
+        return sorted(self._settings_dict()["presets"])
 
     async def save_preset(self, name: str, lib_id: int, steps: list[int]) -> None:
-        s = _load_settings()
+        s = self._settings_dict()
         s.setdefault("presets", {})[name] = {"lib": int(lib_id), "steps": [(int(x) & 0xFF) for x in steps[:8]]}
-        _save_settings(s)
+        self._schedule_settings_flush()
         logger.info(f"Saved preset '{name}'")
 
     async def load_preset(self, name: str) -> dict:
-        s = _load_settings()
+        s = self._settings_dict()
         p = s.get("presets", {}).get(name)
         if not p:
             raise ValueError(f"Preset '{name}' not found")
         return p  # {"lib": int, "steps": [ints]}
 
     async def delete_preset(self, name: str) -> None:
-        s = _load_settings()
+        s = self._settings_dict()
         if s.get("presets", {}).pop(name, None) is None:
             raise ValueError(f"Preset '{name}' not found")
-        _save_settings(s)
+        self._schedule_settings_flush()
         logger.info(f"Deleted preset '{name}'")
 
     async def apply_preset(self, name: str) -> None:
@@ -443,13 +857,11 @@ class Plugin:
         """
         Select ROM library (0..N). Exact meanings depend on DRV2605 variant.
         """
-        async with self._i2c_lock:
-            self._mux_select_current()
-            i2c_write(DRV_ADDR, 0x03, lib_id & 0xFF)
-            logger.info(f"Library set to {lib_id}")
-        s = _load_settings()
+        await self._write_cached(REG_LIBSEL, bytes([lib_id & 0xFF]))
+        logger.info(f"Library set to {lib_id}")
+        s = self._settings_dict()
         s["last_lib"] = int(lib_id)
-        _save_settings(s)
+        self._schedule_settings_flush()
 
     async def program_sequence(self, steps: list[int]) -> None:
         """
@@ -465,58 +877,54 @@ class Plugin:
         if len(steps) > 8:
             raise ValueError("max 8 sequence steps")
 
-        # sanitize to bytes
-        seq = [(int(x) & 0xFF) for x in steps]
+        # sanitize to bytes (no intermediate list)
+        seq = bytearray(int(x) & 0xFF for x in steps)
         if len(seq) < 8 and (len(seq) == 0 or seq[-1] != 0x00):
             seq.append(0x00)  # terminator
 
-        async with self._i2c_lock:
-            self._mux_select_current()
-            # write into 0x04..0x0B
-            for i, b in enumerate(seq[:8]):
-                i2c_write(DRV_ADDR, 0x04 + i, b)
-            logger.info(f"Programmed sequence: {seq[:8]}")
+        # write into 0x04..0x0B as one auto-increment block
+        await self._bus_write(self._mux_writes() + [(DRV_ADDR, 0x04, bytes(seq))])
+        logger.info(f"Programmed sequence: {list(seq)}")
 
     async def play_sequence(self) -> None:
         """
         Play the programmed sequence. MODE=Internal Trigger, GO=1.
         """
-        async with self._i2c_lock:
-            self._mux_select_current()
-            i2c_write(DRV_ADDR, 0x01, 0x00)  # MODE: internal trigger, standby=0
-            i2c_write(DRV_ADDR, 0x0C, 0x01)  # GO
-            logger.info("Sequence PLAY")
+        await self._bus_write(self._mux_writes() + [
+            (DRV_ADDR, REG_MODE, 0x00),  # MODE: internal trigger, standby=0
+            (DRV_ADDR, REG_GO, 0x01),    # GO
+        ])
+        self._drv_last_active = time.monotonic()
+        logger.info("Sequence PLAY")
 
     async def stop_sequence(self) -> None:
         """
         Stop playback quickly by forcing Standby (bit6). 
         Next play clears it back to 0x00.
         """
-        async with self._i2c_lock:
-            self._mux_select_current()
-            i2c_write(DRV_ADDR, 0x01, 0x40)  # MODE: standby bit set
-            logger.info("Sequence STOP (standby)")
+        await self._bus_write(self._mux_writes() + [(DRV_ADDR, REG_MODE, 0x40)])  # MODE: standby bit set
+        logger.info("Sequence STOP (standby)")
     
     async def get_timing_offsets(self) -> dict:
         """
         Read Overdrive/Sustain+/Sustain-/Brake time offsets (0x0D..0x10), 0..255 each.
         """
-        async with self._i2c_lock:
-            if hasattr(self, "_mux_select_current"):
-                self._mux_select_current()
-            try:
-                data = i2c_read_reg(DRV_ADDR, 0x0D, 4)  # 0x0D..0x10
-                ovr, sus_p, sus_n, brk = data[0], data[1], data[2], data[3]
-                logger.info(f"Timing offsets read: {ovr},{sus_p},{sus_n},{brk}")
-                return {
-                    "overdrive": int(ovr),
-                    "sustain_pos": int(sus_p),
-                    "sustain_neg": int(sus_n),
-                    "brake": int(brk),
-                }
-            except Exception as e:
-                logger.error(f"get_timing_offsets failed: {e}")
-                raise
+        def _op():
+            self._mux_select_current()
+            return i2c_read_reg(DRV_ADDR, 0x0D, 4)  # 0x0D..0x10
+        try:
+            data = await self._bus_call(_op)
+            ovr, sus_p, sus_n, brk = data[0], data[1], data[2], data[3]
+            logger.info(f"Timing offsets read: {ovr},{sus_p},{sus_n},{brk}")
+            return {
+                "overdrive": int(ovr),
+                "sustain_pos": int(sus_p),
+                "sustain_neg": int(sus_n),
+                "brake": int(brk),
+            }
+        except Exception as e:
+            logger.error(f"get_timing_offsets failed: {e}")
+            raise
 
     async def set_timing_offsets(self, overdrive: int, sustain_pos: int, sustain_neg: int, brake: int, ) -> None:
         """
@@ -524,22 +932,17 @@ class Plugin:
         """
         def _clamp(v: int) -> int: return max(0, min(255, int(v)))
         ovr, susP, susN, brk = _clamp(overdrive), _clamp(sustain_pos), _clamp(sustain_neg), _clamp(brake)
-        async with self._i2c_lock:
-            if hasattr(self, "_mux_select_current"):
-                self._mux_select_current()
-            i2c_write(DRV_ADDR, 0x0D, ovr)
-            i2c_write(DRV_ADDR, 0x0E, susP)
-            i2c_write(DRV_ADDR, 0x0F, susN)
-            i2c_write(DRV_ADDR, 0x10, brk)
-            logger.info(f"Timing offsets set: {ovr},{susP},{susN},{brk}")
-        s = _load_settings()
+        # 0x0D..0x10 as one auto-increment block
+        await self._write_cached(0x0D, bytes([ovr, susP, susN, brk]))
+        logger.info(f"Timing offsets set: {ovr},{susP},{susN},{brk}")
+        s = self._settings_dict()
         s["last_offsets"] = {"overdrive": ovr, "sustain_pos": susP, "sustain_neg": susN, "brake": brk}
-        _save_settings(s)
+        self._schedule_settings_flush()
 
     async def set_sniffer_autostart(self, enabled: bool) -> None:
-        s = _load_settings()
+        s = self._settings_dict()
         s["autostart_sniffer"] = bool(enabled)
-        _save_settings(s)
+        self._schedule_settings_flush()
         logger.info(f"sniffer autostart set to {s['autostart_sniffer']}")
     
     # --- reset DRV2605 function
@@ -552,44 +955,44 @@ class Plugin:
         - briefly enable Hi-Z (LIBSEL.4=1) then clear
         - leave standby (MODE.6=0)
         """
-        async with self._i2c_lock:
-            try:
-                if hasattr(self, "_mux_select_current"):
-                    self._mux_select_current()
-
-                # Stop any active playback
-                try:
-                    i2c_write(DRV_ADDR, 0x0C, 0x00)  # GO=0
-                except Exception:
-                    pass  # ignore if GO isn't set
+        async def _op():
+            self._reg_shadow.clear()
+            self._last_mux_mask = None  # reselect the channel unconditionally
+            self._mux_select_current()
 
-                # Standby on
-                _rmw_u8(DRV_ADDR, 0x01, clear_mask=0, set_mask=(1 << 6))
+            # Stop any active playback
+            try:
+                i2c_write(DRV_ADDR, 0x0C, 0x00)  # GO=0
+            except Exception:
+                pass  # ignore if GO isn't set
 
-                # Hi-Z pulse
-                _rmw_u8(DRV_ADDR, 0x03, clear_mask=0, set_mask=(1 << 4))
-                await asyncio.sleep(0.01)
-                _rmw_u8(DRV_ADDR, 0x03, clear_mask=(1 << 4), set_mask=0)
+            # Standby on
+            _rmw_u8(DRV_ADDR, 0x01, clear_mask=0, set_mask=(1 << 6))
 
-                # Standby off
-                _rmw_u8(DRV_ADDR, 0x01, clear_mask=(1 << 6), set_mask=0)
+            # Hi-Z pulse
+            _rmw_u8(DRV_ADDR, 0x03, clear_mask=0, set_mask=(1 << 4))
+            await asyncio.sleep(0.01)
+            _rmw_u8(DRV_ADDR, 0x03, clear_mask=(1 << 4), set_mask=0)
 
-                logger.info("reset_device: completed")
-            except Exception as e:
-                logger.error(f"reset_device failed: {e}")
-                raise RuntimeError(f"reset failed: {e}")
+            # Standby off
+            _rmw_u8(DRV_ADDR, 0x01, clear_mask=(1 << 6), set_mask=0)
+        try:
+            await self._bus_call(_op)
+            logger.info("reset_device: completed")
+        except Exception as e:
+            logger.error(f"reset_device failed: {e}")
+            raise RuntimeError(f"reset failed: {e}")
 
     # --- Flags getter for toggle buttons in the Frontend
     async def get_runtime_flags(self) -> dict:
         """
         Return current booleans so UI toggles can stay in sync.
         """
-        async with self._i2c_lock:
-            if hasattr(self, "_mux_select_current"):
-                self._mux_select_current()
-            mode = _read_u8(DRV_ADDR, REG_MODE)
-            lib  = _read_u8(DRV_ADDR, REG_LIBSEL)
-        s = _load_settings()
+        def _op():
+            self._mux_select_current()
+            return i2c_read_reg(DRV_ADDR, REG_MODE, 3)  # MODE, RTP, LIBSEL (auto-increment)
+        mode, _, lib = await self._bus_call(_op)
+        s = self._settings_dict()
         return {
             "standby": bool(mode & 0x40),
             "hi_z":    bool(lib  & 0x10),
@@ -603,17 +1006,16 @@ class Plugin:
         """
         Read Rated Voltage (0x16) and Overdrive Clamp (0x17), 0..255 each.
         """
-        async with self._i2c_lock:
-            if hasattr(self, "_mux_select_current"):
-                self._mux_select_current()
-            try:
-                rated = i2c_read_reg(DRV_ADDR, 0x16, 1)[0]
-                over  = i2c_read_reg(DRV_ADDR, 0x17, 1)[0]
-                logger.info(f"Drive params read: rated={rated}, overdrive={over}")
-                return {"rated": int(rated), "overdrive": int(over)}
-            except Exception as e:
-                logger.error(f"get_drive_params failed: {e}")
-                raise
+        def _op():
+            self._mux_select_current()
+            return i2c_read_reg(DRV_ADDR, 0x16, 2)  # 0x16..0x17 (auto-increment)
+        try:
+            rated, over = await self._bus_call(_op)
+            logger.info(f"Drive params read: rated={rated}, overdrive={over}")
+            return {"rated": int(rated), "overdrive": int(over)}
+        except Exception as e:
+            logger.error(f"get_drive_params failed: {e}")
+            raise
 
     async def set_drive_params(self, rated: int, overdrive: int) -> None:
         """
@@ -623,24 +1025,29 @@ class Plugin:
         def _clamp(v: int) -> int: return max(0, min(255, int(v)))
         rv = _clamp(rated)
         od = _clamp(overdrive)
-        async with self._i2c_lock:
-            if hasattr(self, "_mux_select_current"):
-                self._mux_select_current()
-            i2c_write(DRV_ADDR, 0x16, rv)
-            i2c_write(DRV_ADDR, 0x17, od)
-            logger.info(f"Drive params set: rated={rv}, overdrive={od}")
-        s = _load_settings()
+        # 0x16..0x17 as one auto-increment block
+        await self._write_cached(0x16, bytes([rv, od]))
+        logger.info(f"Drive params set: rated={rv}, overdrive={od}")
+        s = self._settings_dict()
         s["last_drive"] = {"rated": rv, "overdrive": od}
-        _save_settings(s)
+        self._schedule_settings_flush()
 
     # ----- lifecycle -----
 
     async def _main(self):
         # Ensure required kernel modules for features (may fail without root)
-        for mod in ("i2c-dev", "usbmon"):
-            p = subprocess.run(["modprobe", mod])
-            if p.returncode != 0:
-                logger.warning(f"modprobe {mod} failed with code {p.returncode}")
+        # (already loaded ones are skipped; the rest go to a single modprobe -a)
+        missing = [mod for mod in ("i2c-dev", "usbmon") if not _module_loaded(mod)]
+        if missing:
+            try:
+                p = subprocess.run(
+                    ["modprobe", "-a", *missing], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+            except OSError as e:
+                logger.warning(f"modprobe {' '.join(missing)} failed: {e}")
+            else:
+                if p.returncode != 0:
+                    logger.warning(f"modprobe {' '.join(missing)} failed with code {p.returncode}")
 
         # Sanity checks
         dev_path = Path(f"/dev/i2c-{I2C_BUS}")
@@ -648,9 +1055,8 @@ class Plugin:
             logger.warning(f"I2C device {dev_path} not present (load i2c-dev, check bus number)")
         else:
             try:
-                # quick open/close to confirm perms
-                with RawI2C(I2C_BUS):
-                    pass
+                # the permission check is the open of the bus kept for the plugin's lifetime
+                _open_shared_bus()
             except PermissionError:
                 logger.warning(
                     f"No permission for {dev_path}. Add user to 'i2c' group and re-login."
@@ -658,7 +1064,8 @@ class Plugin:
             except Exception as e:
                 logger.warning(f"Opening {dev_path} failed: {e}")
 
-        s = _load_settings()
+        # read the settings file once; everything after this works on the cached dict
+        s = self._settings_dict()
         self.use_mux = bool(s.get("use_mux", False))
         self.mux_mask = int(s.get("mux_mask", 1)) or 1
 
@@ -700,6 +1107,23 @@ class Plugin:
 
     async def _unload(self):
         await self.stop_sniffer()
+        if self._settings_flush_task is not None:
+            self._settings_flush_task.cancel()
+            self._settings_flush_task = None
+            self._flush_settings()
+        await self._bus_call(_close_shared_bus)
+        # fail anything queued behind the close so no caller awaits forever
+        while self._i2c_q:
+            _, fut = self._i2c_q.popleft()
+            if not fut.done():
+                fut.set_exception(RuntimeError("unloading"))
+        if self._i2c_worker is not None:
+            self._i2c_worker.cancel()
+            try:
+                await self._i2c_worker
+            except asyncio.CancelledError:
+                pass
+            self._i2c_worker = None
         logger.info("RumbleDeck backend unloading")
 
     async def _uninstall(self):